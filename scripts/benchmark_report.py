@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""Benchmark Report CLI: metrics table and figures for either phase"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from vcbench.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
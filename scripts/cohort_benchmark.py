@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Cohort Benchmark: pipeline matrix over a samplesheet of samples"""
+
+import argparse
+import csv
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from vcbench.cohort import DEFAULT_JOBS, run_cohort
+from vcbench.registry import PHASES, PROJECT_ROOT, pipeline_matrix
+
+
+def read_cohort_metrics(metrics_path):
+    """Collect per-pipeline Precision/Recall/F1 values from the streamed cohort table."""
+    values = defaultdict(lambda: {"Precision": [], "Recall": [], "F1": []})
+    with open(metrics_path, newline="") as handle:
+        for row in csv.DictReader(handle, delimiter="\t"):
+            if row["status"] != "ok":
+                continue
+            for metric in ("Precision", "Recall", "F1"):
+                values[row["pipeline"]][metric].append(float(row[metric]))
+    return values
+
+
+def read_similarity(similarity_path):
+    with open(similarity_path, newline="") as handle:
+        rows = list(csv.reader(handle, delimiter="\t"))
+    order = rows[0][1:]
+    return order, [[float(value) for value in row[1:]] for row in rows[1:]]
+
+
+def create_cohort_figures(phase, metrics_path, similarity_path, output_dir):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import seaborn as sns
+    sns.set_style("whitegrid")
+
+    pipelines = pipeline_matrix(phase)
+    pipeline_ids = [pipeline["id"] for pipeline in pipelines]
+    values = read_cohort_metrics(metrics_path)
+
+    print("Creating cohort figure 1: F1 distribution per pipeline...")
+    fig, ax = plt.subplots(figsize=(max(8, 1.5 * len(pipeline_ids)), 6))
+    ax.boxplot([values[pid]["F1"] for pid in pipeline_ids])
+    ax.set_xticklabels(pipeline_ids)
+    ax.set_xlabel('Pipeline', fontweight='bold')
+    ax.set_ylabel('F1-Score', fontweight='bold')
+    ax.set_ylim(0, 1)
+    ax.set_title(f'{PHASES[phase]["title"]} Cohort F1 Distribution', fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output_dir / "cohort_f1_distribution.png", dpi=300, bbox_inches='tight')
+    plt.close()
+
+    print("Creating cohort figure 2: Precision vs recall per sample...")
+    fig, ax = plt.subplots(figsize=(8, 7))
+    for pipeline in pipelines:
+        pid = pipeline["id"]
+        ax.scatter(values[pid]["Recall"], values[pid]["Precision"], label=f"{pid}: {pipeline['name']}", alpha=0.7)
+    ax.set_xlabel('Recall', fontweight='bold')
+    ax.set_ylabel('Precision', fontweight='bold')
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.legend(title='Pipeline', fontsize=8, loc='lower left')
+    ax.set_title(f'{PHASES[phase]["title"]} Cohort Precision vs Recall', fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output_dir / "cohort_precision_recall.png", dpi=300, bbox_inches='tight')
+    plt.close()
+
+    print("Creating cohort figure 3: Mean pipeline similarity matrix...")
+    order, matrix = read_similarity(similarity_path)
+    matrix = np.array(matrix)
+    n = len(order)
+    names = {pipeline["id"]: pipeline["name"] for pipeline in pipelines}
+    fig, ax = plt.subplots(figsize=(max(8, 1.3 * n), max(6, 1.1 * n)))
+    annot = [[f'{matrix[i, j]:.2f}' for j in range(n)] for i in range(n)]
+    labels = [f"{pid}\n{names[pid]}" for pid in order]
+    sns.heatmap(matrix, annot=annot, fmt='', cmap='YlOrRd',
+               vmin=0, vmax=1, xticklabels=labels, yticklabels=labels,
+               cbar_kws={'label': 'Mean Jaccard Similarity'}, ax=ax, square=True,
+               linewidths=0.5, linecolor='white')
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+    ax.set_title(f'{PHASES[phase]["title"]} Cohort Pipeline Similarity (Mean Jaccard)', fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output_dir / "cohort_similarity_matrix.png", dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"  Saved cohort figures to: {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run and evaluate the pipeline matrix over a cohort samplesheet")
+    parser.add_argument("--phase", choices=sorted(PHASES), required=True)
+    parser.add_argument("--samplesheet", type=Path, required=True,
+                        help="Sarek-style CSV (patient,[status,]sample,lane,bam,bai) with optional mapper and truth_vcf columns")
+    parser.add_argument("--outdir", type=Path, help="default: results/cohort/<phase>")
+    parser.add_argument("--jobs", type=int, help=f"samples evaluated in parallel (default: {DEFAULT_JOBS}, one per 8 CPUs)")
+    parser.add_argument("--skip-figures", action="store_true", help="only write the metrics and similarity tables")
+    args = parser.parse_args()
+
+    outdir = args.outdir or PROJECT_ROOT / "results" / "cohort" / args.phase
+    print("=" * 60)
+    print(f"{PHASES[args.phase]['title']} Cohort Benchmark")
+    print("=" * 60)
+
+    metrics_path, similarity_path = run_cohort(args.samplesheet, args.phase, outdir, jobs=args.jobs)
+    print(f"Metrics table: {metrics_path}")
+    print(f"Similarity matrix: {similarity_path}")
+    if not args.skip_figures:
+        visualization_dir = outdir / "visualizations"
+        visualization_dir.mkdir(parents=True, exist_ok=True)
+        create_cohort_figures(args.phase, metrics_path, similarity_path, visualization_dir)
+
+
+if __name__ == "__main__":
+    main()
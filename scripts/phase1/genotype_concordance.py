@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Phase 1 Genotype Concordance (HaplotypeCaller / DeepVariant vs GIAB)"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vcbench.registry import PHASES, final_vcf, pipeline_matrix
+
+PHASE = PHASES["phase1"]
+OUTPUT_DIR = PHASE["results_dir"] / "metrics" / "genotype"
+METRIC_COLUMNS = ["TP", "FP", "FN", "Precision", "Recall", "F1", "Site_TP", "GT_Concordance"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genotype-level concordance of the phase 1 pipelines")
+    parser.add_argument("--truth", type=Path, default=PHASE["truth_vcf"])
+    parser.add_argument("--outdir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    try:
+        from vcbench import genotype
+    except ImportError as e:
+        sys.exit(f"ERROR: genotype concordance needs numpy ({e})")
+
+    print("=" * 60)
+    print("Phase 1 Genotype Concordance")
+    print("=" * 60)
+
+    pipelines = [pipeline for pipeline in pipeline_matrix("phase1") if final_vcf("phase1", pipeline).exists()]
+    if not pipelines:
+        sys.exit("ERROR: no phase 1 final filtered VCFs found")
+    truth = genotype.read_genotypes(args.truth)
+    print(f"  Truth: {len(truth[0])} sites")
+    call_sets = {}
+    for pipeline in pipelines:
+        call_sets[pipeline["id"]] = genotype.read_genotypes(final_vcf("phase1", pipeline))
+        print(f"  {pipeline['id']}: {len(call_sets[pipeline['id']][0])} sites")
+
+    confusion = genotype.confusion_matrices(genotype.align_genotypes(truth, call_sets))
+
+    args.outdir.mkdir(parents=True, exist_ok=True)
+    labels = genotype.GENOTYPE_LABELS
+    with open(args.outdir / "genotype_metrics.tsv", "w") as metrics_out, \
+         open(args.outdir / "genotype_confusion.tsv", "w") as confusion_out:
+        metrics_out.write("\t".join(["pipeline", "name"] + METRIC_COLUMNS) + "\n")
+        confusion_out.write("\t".join(["pipeline", "truth"] + [f"call_{label}" for label in labels]) + "\n")
+        for pipeline, matrix in zip(pipelines, confusion):
+            metrics = genotype.genotype_metrics(matrix)
+            values = [f"{metrics[c]:.4f}" if isinstance(metrics[c], float) else str(metrics[c]) for c in METRIC_COLUMNS]
+            metrics_out.write("\t".join([pipeline["id"], pipeline["name"]] + values) + "\n")
+            for label, row in zip(labels, matrix):
+                confusion_out.write("\t".join([pipeline["id"], label] + [str(int(count)) for count in row]) + "\n")
+
+            print(f"\n{pipeline['id']}: {pipeline['name']}")
+            print(f"  {'truth/call':<12}" + "".join(f"{label:>10}" for label in labels))
+            for label, row in zip(labels, matrix):
+                print(f"  {label:<12}" + "".join(f"{int(count):>10}" for count in row))
+            print(f"  GT Precision: {metrics['Precision']:.4f}  GT Recall: {metrics['Recall']:.4f}  "
+                  f"GT F1: {metrics['F1']:.4f}  GT concordance at matched sites: {metrics['GT_Concordance']:.4f}")
+
+    print(f"\nOutput directory: {args.outdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Phase 2 Mapper Coverage Comparison (BWA vs Bowtie)"""
+
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vcbench.registry import PHASES, metrics_dir, pipeline_matrix
+
+PHASE = PHASES["phase2"]
+OUTPUT_DIR = PHASE["results_dir"] / "coverage"
+EXPLANATIONS = ["covered", "mapper_discordant", "low_coverage", "off_target"]
+
+
+def explain_site(mapper, names, depths, min_depth):
+    """Classify an FP/FN site by tumor coverage of its own mapper versus the other mapper."""
+    if depths is None:
+        return "off_target"
+    tumor = {name.split("_")[0]: depth for name, depth in zip(names, depths) if name.endswith("_tumor")}
+    own = tumor.get(mapper, 0)
+    others = [depth for other, depth in tumor.items() if other != mapper]
+    if own >= min_depth:
+        return "covered"
+    if any(depth >= min_depth for depth in others):
+        return "mapper_discordant"
+    return "low_coverage"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BWA and Bowtie coverage and MAPQ over the exome targets")
+    parser.add_argument("--bed", type=Path, default=PHASE["exome_bed"])
+    parser.add_argument("--outdir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--chunk-size", type=int, help="bases per depth window (default: 1,000,000)")
+    parser.add_argument("--min-depth", type=int, help="depth counted as covered (default: 20)")
+    parser.add_argument("--min-region-length", type=int, help="shortest discordant region reported (default: 10)")
+    parser.add_argument("--jobs", type=int, help="contigs processed in parallel (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        from vcbench import coverage
+    except ImportError as e:
+        sys.exit(f"ERROR: coverage comparison needs numpy and pysam ({e})")
+
+    chunk_size = args.chunk_size or coverage.DEFAULT_CHUNK_SIZE
+    min_depth = args.min_depth or coverage.DEFAULT_MIN_DEPTH
+    min_region_length = args.min_region_length or coverage.DEFAULT_MIN_REGION_LENGTH
+
+    print("=" * 60)
+    print("Phase 2 Mapper Coverage Comparison")
+    print("=" * 60)
+
+    pipelines = pipeline_matrix("phase2")
+    sites = coverage.read_sites(pipelines, {pipeline["id"]: metrics_dir("phase2", pipeline) for pipeline in pipelines})
+    print(f"FP/FN sites to annotate: {sum(len(entries) for entries in sites.values())}")
+
+    args.outdir.mkdir(parents=True, exist_ok=True)
+    mapq_totals = {}
+    summary = Counter()
+    with open(args.outdir / "target_coverage.tsv", "w") as targets_out, \
+         open(args.outdir / "discordant_regions.tsv", "w") as regions_out, \
+         open(args.outdir / "fp_fn_sites.tsv", "w") as sites_out:
+        header_written = False
+        regions_out.write("contig\tstart\tend\tlength\tsample\tcovered_by\tseries_a\tmean_depth_a\tseries_b\tmean_depth_b\n")
+
+        for result in coverage.profile_coverage(PHASE["bams"], args.bed, sites=sites, chunk_size=chunk_size,
+                                                min_depth=min_depth, min_region_length=min_region_length,
+                                                jobs=args.jobs):
+            names = result["names"]
+            if not header_written:
+                targets_out.write("\t".join(["contig", "start", "end"]
+                                            + [f"mean_depth_{name}" for name in names]
+                                            + [f"pct_ge_{min_depth}x_{name}" for name in names]) + "\n")
+                sites_out.write("\t".join(["pipeline", "class", "contig", "pos", "mapper"]
+                                          + [f"depth_{name}" for name in names] + ["explanation"]) + "\n")
+                header_written = True
+
+            for index, (start, end) in enumerate(result["targets"]):
+                length = end - start
+                means = [f"{value / length:.2f}" for value in result["target_sums"][index]]
+                pcts = [f"{100 * value / length:.1f}" for value in result["target_covered"][index]]
+                targets_out.write("\t".join([result["contig"], str(start), str(end)] + means + pcts) + "\n")
+
+            for region in result["regions"]:
+                length = region["end"] - region["start"]
+                regions_out.write(f"{region['contig']}\t{region['start']}\t{region['end']}\t{length}\t"
+                                  f"{region['sample']}\t{region['covered_by']}\t"
+                                  f"{region['a']}\t{region['sums'][0] / length:.2f}\t"
+                                  f"{region['b']}\t{region['sums'][1] / length:.2f}\n")
+
+            for (pos, pid, mapper, label), depths in result["sites"]:
+                explanation = explain_site(mapper, names, depths, min_depth)
+                summary[(pid, label, explanation)] += 1
+                values = ["NA"] * len(names) if depths is None else [str(int(depth)) for depth in depths]
+                sites_out.write("\t".join([pid, label, result["contig"], str(pos), mapper] + values
+                                          + [explanation]) + "\n")
+
+            for name, counts in result["mapq"].items():
+                mapq_totals[name] = counts if name not in mapq_totals else mapq_totals[name] + counts
+            if result["targets"]:
+                print(f"  {result['contig']}: {len(result['targets'])} targets, "
+                      f"{len(result['regions'])} discordant regions")
+            else:
+                print(f"  {result['contig']}: {len(result['sites'])} off-target FP/FN sites")
+
+    names = list(mapq_totals)
+    with open(args.outdir / "mapq_distribution.tsv", "w") as handle:
+        handle.write("\t".join(["mapq"] + names) + "\n")
+        for mapq in range(coverage.MAPQ_BINS):
+            counts = [int(mapq_totals[name][mapq]) for name in names]
+            if any(counts):
+                handle.write("\t".join([str(mapq)] + [str(count) for count in counts]) + "\n")
+
+    with open(args.outdir / "fp_fn_coverage_summary.tsv", "w") as handle:
+        handle.write("\t".join(["pipeline", "class", "total"] + EXPLANATIONS) + "\n")
+        print("\nFP/FN sites by coverage explanation:")
+        for pipeline in pipelines:
+            for label in ("FP", "FN"):
+                counts = [summary[(pipeline["id"], label, explanation)] for explanation in EXPLANATIONS]
+                handle.write("\t".join([pipeline["id"], label, str(sum(counts))] + [str(c) for c in counts]) + "\n")
+                print(f"  {pipeline['id']} {label}: " + ", ".join(f"{e}={c}" for e, c in zip(EXPLANATIONS, counts)))
+
+    print(f"\nOutput directory: {args.outdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared helpers for the phase 1 and phase 2 benchmark scripts"""
@@ -0,0 +1,157 @@
+"""Command-line interface shared by the phase 1 and phase 2 reports
+
+``metrics`` prints the TP/FP/FN table as JSON or TSV and never imports the
+plotting libraries. ``render`` draws the report figures, one per worker
+process; the plotting stack is imported only inside the workers.
+"""
+
+import argparse
+import json
+import sys
+import traceback
+from multiprocessing import Pool
+from pathlib import Path
+
+from .registry import PHASES
+from .report import (FIGURE_FILES, METRIC_COLUMNS, cache_inputs, compute_all_metrics, compute_report_data,
+                     read_all_variants, select_pipelines, similarity_order)
+from .report_cache import CACHE_FILENAME, empty_cache, load_cache, refresh_cache, save_cache
+from .tools import DEFAULT_CONCURRENCY
+
+
+def render_figure(task):
+    """Pool worker: draw one figure from the data computed by the parent process."""
+    from . import plots
+
+    phase, pipelines, output_dir, data = task["phase"], task["pipelines"], task["output_dir"], task["data"]
+    if task["figure"] == "filtering":
+        return plots.visualization_1_filtering_counts(phase, pipelines, output_dir)
+    if task["figure"] == "metrics":
+        return plots.visualization_2_metrics(phase, pipelines, output_dir, data)
+    return plots.visualization_3_similarity_matrix(phase, pipelines, output_dir, data)
+
+
+def run_metrics(args):
+    pipelines = select_pipelines(args.phase, args.pipelines)
+    metrics = compute_all_metrics(args.phase, pipelines, args.results_dir, args.max_tools)
+    rows = [{"pipeline": pipeline["id"], "name": pipeline["name"], **metrics[pipeline["id"]]} for pipeline in pipelines]
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump({"phase": args.phase, "metrics": rows}, out, indent=2)
+            out.write("\n")
+        else:
+            out.write("\t".join(["pipeline", "name"] + METRIC_COLUMNS) + "\n")
+            for row in rows:
+                values = [f"{row[c]:.4f}" if isinstance(row[c], float) else str(row[c]) for c in METRIC_COLUMNS]
+                out.write("\t".join([row["pipeline"], row["name"]] + values) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def run_render(args):
+    phase, results_dir = args.phase, args.results_dir
+    pipelines = select_pipelines(phase, args.pipelines)
+    by_id = {pipeline["id"]: pipeline for pipeline in pipelines}
+    output_dir = args.outdir or PHASES[phase]["results_dir"] / "visualizations"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    figures = args.figures or list(FIGURE_FILES)
+
+    print("=" * 60)
+    print(f"{PHASES[phase]['title']} Pipeline Visualization Generator")
+    print("=" * 60)
+
+    data, cache = {}, None
+    if args.incremental:
+        cache = load_cache(output_dir / CACHE_FILENAME)
+        selection = {"phase": phase, "results_dir": str(results_dir or PHASES[phase]["results_dir"]),
+                     "pipelines": list(by_id)}
+        previous = cache.get("selection") or {}
+        if (previous.get("phase"), previous.get("results_dir")) != (selection["phase"], selection["results_dir"]):
+            cache = empty_cache()
+        order = similarity_order(phase, pipelines)
+        vcf_inputs, metric_inputs = cache_inputs(phase, pipelines, results_dir)
+        changed = refresh_cache(
+            cache, order,
+            vcf_inputs={pid: vcf_inputs[pid] for pid in order},
+            metric_inputs=metric_inputs,
+            read_variants=lambda pids: read_all_variants(phase, [by_id[pid] for pid in pids], results_dir,
+                                                         args.max_tools),
+            compute_metrics=lambda pids: compute_all_metrics(phase, [by_id[pid] for pid in pids], results_dir,
+                                                             args.max_tools))
+        # Every figure lists the selected pipelines, so a new selection redraws them all.
+        if previous.get("pipelines") != selection["pipelines"]:
+            changed |= set(FIGURE_FILES)
+        cache["selection"] = selection
+        # Figures left out of --figures stay dirty until a later run draws them.
+        dirty = set(cache.get("dirty", [])) | changed
+        dirty |= {figure for figure, name in FIGURE_FILES.items() if not (output_dir / name).exists()}
+        figures = [figure for figure in figures if figure in dirty]
+        cache["dirty"] = sorted(dirty - set(figures))
+        data = {"metrics": {pid: cache["metrics"][pid] for pid in by_id}, "similarity": cache["similarity"]}
+    else:
+        # Read every VCF the figures need here, in one fan-out bounded by --max-tools.
+        datasets = [figure for figure in figures if figure in ("metrics", "similarity")]
+        if datasets:
+            data = compute_report_data(phase, pipelines, datasets, results_dir, args.max_tools)
+
+    if figures:
+        tasks = [{"figure": figure, "phase": phase, "pipelines": pipelines, "output_dir": output_dir,
+                  "data": data.get(figure)} for figure in figures]
+        print(f"Rendering {len(tasks)} figure(s): {', '.join(figures)}")
+        with Pool(processes=min(args.jobs or len(tasks), len(tasks))) as pool:
+            for path in pool.imap_unordered(render_figure, tasks):
+                print(f"  Saved: {path}")
+    else:
+        print("No report data changed; the requested figures are up to date.")
+    if cache is not None and cache["dirty"]:
+        print(f"Still out of date (not requested): {', '.join(cache['dirty'])}")
+
+    if cache is not None:
+        save_cache(output_dir / CACHE_FILENAME, cache)
+    print(f"Output directory: {output_dir}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Variant calling benchmark reports")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--phase", choices=sorted(PHASES), required=True)
+    common.add_argument("--pipelines", type=lambda value: value.split(","),
+                        help="comma-separated pipeline ids (default: every pipeline of the phase)")
+    common.add_argument("--results-dir", type=Path,
+                        help="directory holding filtered/ and metrics/ (default: results/<phase>)")
+    common.add_argument("--max-tools", type=int,
+                        help=f"concurrent bcftools processes (default: {DEFAULT_CONCURRENCY})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    metrics = subparsers.add_parser("metrics", parents=[common], help="print the metrics table")
+    metrics.add_argument("--format", choices=["json", "tsv"], default="tsv")
+    metrics.add_argument("--output", type=Path, help="write to a file instead of stdout")
+    metrics.set_defaults(func=run_metrics)
+
+    render = subparsers.add_parser("render", parents=[common], help="draw the report figures")
+    render.add_argument("--outdir", type=Path, help="default: results/<phase>/visualizations")
+    render.add_argument("--figures", type=lambda value: value.split(","),
+                        help=f"comma-separated subset of: {', '.join(FIGURE_FILES)}")
+    render.add_argument("--jobs", type=int, help="figures rendered in parallel (default: one process per figure)")
+    render.add_argument("--incremental", action="store_true",
+                        help="reuse cached results and only recompute pipelines whose inputs changed")
+    render.set_defaults(func=run_render)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [figure for figure in getattr(args, "figures", None) or [] if figure not in FIGURE_FILES]
+    if unknown:
+        parser.error(f"unknown figure(s): {', '.join(unknown)}")
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return 1
+    return 0
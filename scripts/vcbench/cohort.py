@@ -0,0 +1,296 @@
+"""Cohort mode: run and evaluate the pipeline matrix over a samplesheet
+
+Work is sharded by sample: one worker process calls, filters and scores
+every pipeline for a single patient, keeps that patient's variant sets
+only long enough to build its Jaccard matrix, and returns metric rows and
+the matrix. The parent streams rows into one cohort table as samples
+finish and keeps a running sum of the similarity matrices, so memory is
+bounded by the number of workers rather than the cohort size.
+"""
+
+import asyncio
+import csv
+import fnmatch
+import os
+import traceback
+from multiprocessing import Pool
+from pathlib import Path
+
+from . import tools
+from .metrics import ISEC_FILES, summarize
+from .registry import CALLERS, PHASES, PROJECT_ROOT, REFERENCE_FASTA, pipeline_matrix, sarek_config
+from .report_cache import update_similarity
+
+REQUIRED_COLUMNS = ("patient", "sample", "bam")
+# Each sample runs Sarek and COSAP jobs that use up to 8 CPUs themselves.
+DEFAULT_JOBS = max(1, (os.cpu_count() or 1) // 8)
+METRIC_COLUMNS = ["patient", "pipeline", "name", "mapper", "workflow", "caller",
+                  "TP", "FP", "FN", "Precision", "Recall", "F1", "status"]
+
+
+def _resolve(path):
+    path = Path(path)
+    return str(path if path.is_absolute() else PROJECT_ROOT / path)
+
+
+def read_samplesheet(samplesheet, phase):
+    """Group samplesheet rows into one task per patient.
+
+    Columns follow Sarek's samplesheet (patient, status, sample, lane, bam,
+    bai) plus optional ``mapper`` (defaults to the phase's first mapper) and
+    ``truth_vcf`` (defaults to the phase truth set). Relative paths are
+    resolved against the project root, where the command scripts run.
+    """
+    config = PHASES[phase]
+    patients = {}
+    with open(samplesheet, newline="") as handle:
+        reader = csv.DictReader(handle)
+        columns = reader.fieldnames or []
+        required = REQUIRED_COLUMNS + (("status",) if config["somatic"] else ())
+        missing = [column for column in required if column not in columns]
+        if missing:
+            raise ValueError(f"{samplesheet}: missing samplesheet column(s): {', '.join(missing)}")
+
+        for line_no, row in enumerate(reader, start=2):
+            mapper = (row.get("mapper") or config["mappers"][0]).strip().lower()
+            if mapper not in config["mappers"]:
+                raise ValueError(f"{samplesheet}:{line_no}: mapper '{mapper}' is not part of {phase}")
+            if config["somatic"]:
+                if row["status"] not in ("0", "1"):
+                    raise ValueError(f"{samplesheet}:{line_no}: status must be 0 (normal) or 1 (tumor)")
+                role = "tumor" if row["status"] == "1" else "normal"
+            else:
+                role = "germline"
+
+            patient = patients.setdefault(row["patient"], {
+                "patient": row["patient"], "truth_vcf": str(config["truth_vcf"]), "bams": {}})
+            if row.get("truth_vcf"):
+                patient["truth_vcf"] = _resolve(row["truth_vcf"])
+            roles = patient["bams"].setdefault(mapper, {})
+            if role in roles:
+                raise ValueError(f"{samplesheet}:{line_no}: duplicate {role} BAM for {row['patient']} ({mapper})")
+            bam = _resolve(row["bam"])
+            roles[role] = {"sample": row["sample"], "lane": row.get("lane") or "1",
+                           "bam": bam, "bai": _resolve(row["bai"]) if row.get("bai") else bam + ".bai"}
+
+    expected = {"tumor", "normal"} if config["somatic"] else {"germline"}
+    for patient in patients.values():
+        for mapper, roles in patient["bams"].items():
+            if set(roles) != expected:
+                raise ValueError(f"{samplesheet}: {patient['patient']} ({mapper}) needs "
+                                 f"{' and '.join(sorted(expected))} BAMs, got {', '.join(sorted(roles))}")
+    return list(patients.values())
+
+
+def run_tool(argv, log, cwd=None):
+    asyncio.run(tools.run_tool(argv, cwd=cwd, log=log))
+
+
+def _find_vcfs(root, patterns):
+    found = []
+    for pattern in patterns:
+        matches = sorted(str(path) for path in Path(root).rglob("*") if fnmatch.fnmatch(path.name, pattern))
+        if not matches:
+            return []
+        found.append(matches[0])
+    return found
+
+
+def find_raw_vcfs(pipeline, workdir):
+    caller = CALLERS[pipeline["caller"]]
+    if pipeline["workflow"] == "sarek":
+        return _find_vcfs(workdir / "sarek", caller["sarek_vcfs"])
+    for candidate in caller["cosap_vcfs"]:
+        if (workdir / "cosap" / candidate).exists():
+            return [str(workdir / "cosap" / candidate)]
+    return []
+
+
+def _write_sarek_samplesheet(path, patient, roles, somatic):
+    columns = ["patient", "status", "sample", "lane", "bam", "bai"] if somatic else ["patient", "sample", "lane", "bam", "bai"]
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        for role, entry in sorted(roles.items()):
+            row = {"patient": patient, "sample": entry["sample"], "lane": entry["lane"],
+                   "bam": entry["bam"], "bai": entry["bai"]}
+            if somatic:
+                row["status"] = "1" if role == "tumor" else "0"
+            writer.writerow(row)
+
+
+def _run_cosap(caller, roles, outdir):
+    from cosap.workflows import Pipeline, PipelineRunner, BamReader, VariantCaller
+
+    pipeline = Pipeline()
+    readers = {role: BamReader(entry["bam"], name=entry["sample"]) for role, entry in roles.items()}
+    if "tumor" in readers:
+        variant_caller = VariantCaller(library=caller["cosap_library"], name=caller["cosap_name"],
+                                       tumor=readers["tumor"], germline=readers["normal"])
+    else:
+        variant_caller = VariantCaller(library=caller["cosap_library"], name=caller["cosap_name"],
+                                       germline=readers["germline"], gvcf=False)
+    for reader in readers.values():
+        reader.next_step = variant_caller
+        pipeline.add(reader)
+    pipeline.add(variant_caller)
+    PipelineRunner(device="cpu").run_pipeline(pipeline.build(workdir=str(outdir)))
+
+
+def call_variants(phase, patient, pipeline, workdir, log):
+    caller = CALLERS[pipeline["caller"]]
+    roles = patient["bams"][pipeline["mapper"]]
+    if pipeline["workflow"] == "sarek":
+        outdir = workdir / "sarek"
+        outdir.mkdir(parents=True, exist_ok=True)
+        samplesheet = workdir / "samplesheet.csv"
+        _write_sarek_samplesheet(samplesheet, patient["patient"], roles, PHASES[phase]["somatic"])
+        # Each run gets its own launch directory so concurrent Nextflow runs don't share a lock.
+        run_tool(["nextflow", "run", "nf-core/sarek", "-r", "master", "-profile", "docker",
+                  "--input", samplesheet, "--step", "variant_calling", "--tools", caller["sarek_tool"],
+                  "--genome", "GATK.GRCh38", "--fasta", REFERENCE_FASTA, "--outdir", outdir,
+                  "--skip_tools", "fastqc,samtools,mosdepth",
+                  *PHASES[phase]["sarek_args"], *caller.get("sarek_args", []),
+                  "-c", sarek_config(phase, pipeline["mapper"], pipeline["caller"])],
+                 log, cwd=workdir)
+    else:
+        outdir = workdir / "cosap"
+        outdir.mkdir(parents=True, exist_ok=True)
+        log.write(f"COSAP {caller['cosap_library']} -> {outdir}\n")
+        log.flush()
+        _run_cosap(caller, roles, outdir)
+
+    raw_vcfs = find_raw_vcfs(pipeline, workdir)
+    if not raw_vcfs:
+        raise RuntimeError(f"no {caller['label']} output VCF found under {workdir}")
+    return raw_vcfs
+
+
+def _index_vcf(vcf, log):
+    run_tool(["tabix", "-f", "-p", "vcf", vcf], log)
+    return vcf
+
+
+def filter_variants(phase, pipeline, raw_vcfs, workdir, log):
+    """Apply the ploidy fix, exome, high-confidence and PASS filters of the command scripts."""
+    config = PHASES[phase]
+    filtered = workdir / "filtered"
+    filtered.mkdir(parents=True, exist_ok=True)
+
+    raw_vcf = raw_vcfs[0]
+    if len(raw_vcfs) > 1:
+        raw_vcf = filtered / "merged.vcf.gz"
+        run_tool(["bcftools", "concat", "-a", *raw_vcfs, "-O", "z", "-o", raw_vcf], log)
+
+    fixed = filtered / "fixed_ploidy.vcf.gz"
+    run_tool(["bcftools", "+fixploidy", raw_vcf, "-O", "z", "-o", fixed], log)
+    _index_vcf(fixed, log)
+    exome = filtered / "exome_filtered.vcf.gz"
+    run_tool(["bcftools", "view", "-R", config["exome_bed"], fixed, "-O", "z", "-o", exome], log)
+    _index_vcf(exome, log)
+    hc = filtered / "hc_filtered.vcf.gz"
+    run_tool(["bcftools", "view", "-R", config["hc_bed"], exome, "-O", "z", "-o", hc], log)
+    _index_vcf(hc, log)
+    final = filtered / "final_filtered.vcf.gz"
+    run_tool(["bcftools", "view", *CALLERS[pipeline["caller"]]["pass_filter"], hc, "-O", "z", "-o", final], log)
+    return _index_vcf(final, log)
+
+
+def evaluate_pipeline(phase, patient, pipeline, workdir, log):
+    raw_vcfs = find_raw_vcfs(pipeline, workdir) or call_variants(phase, patient, pipeline, workdir, log)
+    final_vcf = filter_variants(phase, pipeline, raw_vcfs, workdir, log)
+    metrics_dir = workdir / "metrics"
+    run_tool(["bcftools", "isec", "-p", metrics_dir, "-c", "both", final_vcf, patient["truth_vcf"]], log)
+    *counts, variants = tools.read_vcfs([(metrics_dir / name, tools.CountRecords, 0) for name in ISEC_FILES.values()]
+                                        + [(final_vcf, tools.VariantKeys, set())])
+    return summarize(**{label.lower(): count for label, count in zip(ISEC_FILES, counts)}), variants
+
+
+def write_similarity(path, similarity):
+    with open(path, "w") as handle:
+        handle.write("\t".join(["pipeline"] + similarity["order"]) + "\n")
+        for pid, row in zip(similarity["order"], similarity["values"]):
+            handle.write("\t".join([pid] + [f"{value:.6f}" for value in row]) + "\n")
+
+
+def _failure_status(error):
+    """One-line, tab-free status for the metrics table; details stay in the sample log."""
+    message = getattr(error, "summary", None) or str(error).strip() or type(error).__name__
+    return "failed: " + " ".join(message.splitlines()[0].split())
+
+
+def evaluate_sample(task):
+    """Pool worker: run every pipeline of the matrix for one patient."""
+    phase, patient = task["phase"], task["patient"]
+    sample_dir = Path(task["outdir"]) / "samples" / patient["patient"]
+    sample_dir.mkdir(parents=True, exist_ok=True)
+    rows, variants = [], {}
+
+    with open(sample_dir / "cohort.log", "a") as log:
+        for pipeline in pipeline_matrix(phase):
+            if pipeline["mapper"] not in patient["bams"]:
+                continue
+            row = {"patient": patient["patient"], "pipeline": pipeline["id"], "name": pipeline["name"],
+                   "mapper": pipeline["mapper"], "workflow": pipeline["workflow"], "caller": pipeline["caller"]}
+            workdir = sample_dir / pipeline["mapper"] / pipeline["workflow"] / pipeline["caller"]
+            try:
+                metrics, variants[pipeline["id"]] = evaluate_pipeline(phase, patient, pipeline, workdir, log)
+                row.update(metrics, status="ok")
+            except Exception as e:
+                # Any failure (tools, COSAP, bad inputs) only fails this pipeline's row.
+                log.write(f"ERROR {pipeline['id']}: {e}\n{traceback.format_exc()}")
+                log.flush()
+                row["status"] = _failure_status(e)
+            rows.append(row)
+
+    order = list(variants)
+    similarity = update_similarity(None, order, variants, order)
+    write_similarity(sample_dir / "similarity.tsv", similarity)
+    return {"patient": patient["patient"], "rows": rows, "similarity": similarity}
+
+
+def _format_row(row):
+    values = []
+    for column in METRIC_COLUMNS:
+        value = row.get(column, "")
+        values.append(f"{value:.6f}" if isinstance(value, float) else str(value))
+    return "\t".join(values) + "\n"
+
+
+def run_cohort(samplesheet, phase, outdir, jobs=None):
+    """Evaluate every patient in ``samplesheet`` and stream metrics into ``outdir``.
+
+    Writes cohort_metrics.tsv (one row per patient x pipeline, appended as
+    samples finish) and cohort_similarity.tsv (mean pairwise Jaccard over
+    the patients where both pipelines succeeded). Returns their paths.
+    """
+    # Absolute, because Nextflow runs from each pipeline's own work directory.
+    outdir = Path(outdir).resolve()
+    outdir.mkdir(parents=True, exist_ok=True)
+    patients = read_samplesheet(samplesheet, phase)
+    tasks = [{"phase": phase, "patient": patient, "outdir": str(outdir)} for patient in patients]
+    order = [pipeline["id"] for pipeline in pipeline_matrix(phase)]
+    n = len(order)
+    sums = [[0.0] * n for _ in range(n)]
+    counts = [[0] * n for _ in range(n)]
+
+    metrics_path = outdir / "cohort_metrics.tsv"
+    with open(metrics_path, "w") as table, Pool(processes=jobs or DEFAULT_JOBS) as pool:
+        table.write("\t".join(METRIC_COLUMNS) + "\n")
+        for done, result in enumerate(pool.imap_unordered(evaluate_sample, tasks), start=1):
+            for row in result["rows"]:
+                table.write(_format_row(row))
+            table.flush()
+            sample_order = result["similarity"]["order"]
+            for i, pid1 in enumerate(sample_order):
+                for j, pid2 in enumerate(sample_order):
+                    a, b = order.index(pid1), order.index(pid2)
+                    sums[a][b] += result["similarity"]["values"][i][j]
+                    counts[a][b] += 1
+            failed = sum(1 for row in result["rows"] if row["status"] != "ok")
+            print(f"  [{done}/{len(tasks)}] {result['patient']}: {len(result['rows']) - failed} ok, {failed} failed")
+
+    similarity_path = outdir / "cohort_similarity.tsv"
+    values = [[sums[i][j] / counts[i][j] if counts[i][j] else float("nan") for j in range(n)] for i in range(n)]
+    write_similarity(similarity_path, {"order": order, "values": values})
+    return metrics_path, similarity_path
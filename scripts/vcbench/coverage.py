@@ -0,0 +1,230 @@
+"""Streaming BAM coverage and mapping-quality comparison between mappers
+
+Targets from the exome BED are grouped into fixed-size windows per contig.
+For each window a NumPy depth array is filled per BAM from the reads
+overlapping its targets, then reduced to per-target depth statistics,
+MAPQ histograms, discordant-coverage runs and depths at FP/FN sites before
+the next window is loaded, so memory is bounded by the chunk size.
+Contigs are processed in parallel.
+"""
+
+import gzip
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+import pysam
+
+from .metrics import open_vcf
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+DEFAULT_MIN_DEPTH = 20
+DEFAULT_MIN_REGION_LENGTH = 10
+MAPQ_BINS = 256
+# unmapped, secondary, QC-fail, duplicate, supplementary
+READ_FILTER_FLAGS = 0x4 | 0x100 | 0x200 | 0x400 | 0x800
+
+
+def read_bed_targets(bed_path):
+    """Return {contig: [(start, end), ...]} with overlapping targets merged."""
+    opener = gzip.open if str(bed_path).endswith(".gz") else open
+    intervals = defaultdict(list)
+    with opener(bed_path, "rt") as handle:
+        for line in handle:
+            if not line.strip() or line.startswith(("#", "track", "browser")):
+                continue
+            fields = line.split("\t")
+            intervals[fields[0]].append((int(fields[1]), int(fields[2])))
+
+    targets = {}
+    for contig, spans in intervals.items():
+        merged = []
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        targets[contig] = merged
+    return targets
+
+
+def chunk_targets(targets, chunk_size):
+    """Split a contig's targets into pieces grouped by fixed ``chunk_size`` windows.
+
+    Yields (window_start, window_end, [(target_index, start, end), ...]); the
+    window spans only its pieces, so it is never longer than ``chunk_size``.
+    """
+    current, pieces = None, []
+    for index, (start, end) in enumerate(targets):
+        while start < end:
+            window = start // chunk_size
+            piece_end = min(end, (window + 1) * chunk_size)
+            if window != current and pieces:
+                yield pieces[0][1], pieces[-1][2], pieces
+                pieces = []
+            current = window
+            pieces.append((index, start, piece_end))
+            start = piece_end
+    if pieces:
+        yield pieces[0][1], pieces[-1][2], pieces
+
+
+def read_sites(phase_pipelines, metrics_dirs):
+    """Collect FP (0000.vcf) and FN (0001.vcf) sites per contig from the isec directories."""
+    sites = defaultdict(list)
+    for pipeline in phase_pipelines:
+        for label, name in (("FP", "0000.vcf"), ("FN", "0001.vcf")):
+            path = metrics_dirs[pipeline["id"]] / name
+            if not path.exists():
+                continue
+            with open_vcf(path) as handle:
+                for line in handle:
+                    if line.startswith("#"):
+                        continue
+                    fields = line.split("\t", 2)
+                    sites[fields[0]].append((int(fields[1]), pipeline["id"], pipeline["mapper"], label))
+    return {contig: sorted(entries) for contig, entries in sites.items()}
+
+
+def _fill_depth(bam, contig, window_start, pieces, depth, mapq_counts, previous_end):
+    """Add the aligned blocks of reads overlapping ``pieces`` to ``depth``.
+
+    Each read is counted once in ``mapq_counts``: in the first piece it
+    overlaps, i.e. the piece for which it starts at or after the end of the
+    previous piece. Returns the end of the last piece.
+    """
+    diff = np.zeros(len(depth) + 1, dtype=np.int32)
+    starts, ends = [], []
+    for _, start, end in pieces:
+        for read in bam.fetch(contig, start, end):
+            if read.flag & READ_FILTER_FLAGS:
+                continue
+            if read.reference_start >= previous_end:
+                mapq_counts[min(read.mapping_quality, MAPQ_BINS - 1)] += 1
+            for block_start, block_end in read.get_blocks():
+                block_start, block_end = max(block_start, start), min(block_end, end)
+                if block_start < block_end:
+                    starts.append(block_start - window_start)
+                    ends.append(block_end - window_start)
+        previous_end = end
+    np.add.at(diff, np.asarray(starts, dtype=np.int64), 1)
+    np.add.at(diff, np.asarray(ends, dtype=np.int64), -1)
+    depth[:] = np.cumsum(diff[:-1])
+    return previous_end
+
+
+def _mask_runs(mask):
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2], edges[1::2]
+
+
+def profile_contig(task):
+    """Pool worker: profile every target window of one contig."""
+    contig, targets, sites = task["contig"], task["targets"], task["sites"]
+    series = task["series"]
+    min_depth = task["min_depth"]
+    bams = {name: pysam.AlignmentFile(str(path), "rb") for name, path in series.items()}
+    names = list(series)
+
+    target_sums = np.zeros((len(targets), len(names)), dtype=np.int64)
+    target_covered = np.zeros((len(targets), len(names)), dtype=np.int64)
+    mapq = {name: np.zeros(MAPQ_BINS, dtype=np.int64) for name in names}
+    previous_end = {name: 0 for name in names}
+    regions, site_rows = [], []
+    # Most recent run per (sample, covered_by), so runs split by a window boundary are rejoined.
+    last_region = {}
+    site_positions = np.array([site[0] - 1 for site in sites], dtype=np.int64)
+
+    for window_start, window_end, pieces in chunk_targets(targets, task["chunk_size"]):
+        length = window_end - window_start
+        depth = np.zeros((len(names), length), dtype=np.int32)
+        for row, name in enumerate(names):
+            previous_end[name] = _fill_depth(bams[name], contig, window_start, pieces,
+                                             depth[row], mapq[name], previous_end[name])
+
+        in_target = np.zeros(length, dtype=bool)
+        for index, start, end in pieces:
+            local = slice(start - window_start, end - window_start)
+            in_target[local] = True
+            target_sums[index] += depth[:, local].sum(axis=1)
+            target_covered[index] += (depth[:, local] >= min_depth).sum(axis=1)
+
+        covered = depth >= min_depth
+        for pair in task["pairs"]:
+            a, b = names.index(pair["a"]), names.index(pair["b"])
+            for label, mask in ((pair["a"], covered[a] & ~covered[b]), (pair["b"], covered[b] & ~covered[a])):
+                for run_start, run_end in zip(*_mask_runs(mask & in_target)):
+                    start, end = window_start + int(run_start), window_start + int(run_end)
+                    sums = depth[[a, b], run_start:run_end].sum(axis=1)
+                    last = last_region.get((pair["sample"], label))
+                    if last and last["end"] == start:
+                        last["end"] = end
+                        last["sums"] += sums
+                    else:
+                        last_region[(pair["sample"], label)] = {
+                            "contig": contig, "start": start, "end": end, "sample": pair["sample"],
+                            "covered_by": label, "a": pair["a"], "b": pair["b"], "sums": sums}
+                        regions.append(last_region[(pair["sample"], label)])
+
+        lo, hi = np.searchsorted(site_positions, [window_start, window_end])
+        for site_index in range(lo, hi):
+            position = int(site_positions[site_index])
+            local = position - window_start
+            site_depth = depth[:, local] if in_target[local] else None
+            site_rows.append((sites[site_index], site_depth))
+
+    for bam in bams.values():
+        bam.close()
+
+    regions = sorted((region for region in regions if region["end"] - region["start"] >= task["min_region_length"]),
+                     key=lambda region: (region["start"], region["sample"], region["covered_by"]))
+    covered_sites = {row[0] for row in site_rows}
+    site_rows.extend((site, None) for site in sites if site not in covered_sites)
+    return {"contig": contig, "targets": targets, "names": names, "target_sums": target_sums,
+            "target_covered": target_covered, "mapq": mapq, "regions": regions, "sites": site_rows}
+
+
+def profile_coverage(bams, bed_path, sites=None, chunk_size=DEFAULT_CHUNK_SIZE, min_depth=DEFAULT_MIN_DEPTH,
+                     min_region_length=DEFAULT_MIN_REGION_LENGTH, jobs=None):
+    """Profile ``bams`` ({mapper: {sample: path}}) over the targets in ``bed_path``.
+
+    Mappers are compared pairwise per sample for discordant coverage.
+    ``sites`` ({contig: [(pos, pipeline, mapper, class), ...]}) are looked up
+    in the same pass. Yields one result dict per contig, in BED order, then
+    one target-less result per remaining contig that only has sites. BED
+    contigs missing from any BAM header are skipped.
+    """
+    series = {f"{mapper}_{sample}": path for mapper, samples in bams.items() for sample, path in samples.items()}
+    mappers = list(bams)
+    samples = sorted({sample for per_mapper in bams.values() for sample in per_mapper})
+    pairs = [{"sample": sample, "a": f"{mappers[i]}_{sample}", "b": f"{mappers[j]}_{sample}"}
+             for sample in samples for i in range(len(mappers)) for j in range(i + 1, len(mappers))
+             if f"{mappers[i]}_{sample}" in series and f"{mappers[j]}_{sample}" in series]
+
+    references = None
+    for path in series.values():
+        with pysam.AlignmentFile(str(path), "rb") as bam:
+            references = set(bam.references) if references is None else references & set(bam.references)
+    bed_targets = read_bed_targets(bed_path)
+    skipped = [contig for contig in bed_targets if contig not in references]
+    if skipped:
+        print(f"  Skipping {len(skipped)} BED contig(s) missing from the BAM headers: {', '.join(skipped)}")
+
+    sites = sites or {}
+    tasks = [{"contig": contig, "targets": targets, "sites": sites.get(contig, []), "series": series,
+              "pairs": pairs, "chunk_size": chunk_size, "min_depth": min_depth,
+              "min_region_length": min_region_length}
+             for contig, targets in bed_targets.items() if contig in references]
+    with Pool(processes=jobs) as pool:
+        yield from pool.imap(profile_contig, tasks)
+
+    profiled = {task["contig"] for task in tasks}
+    names = list(series)
+    for contig, entries in sites.items():
+        if contig not in profiled:
+            yield {"contig": contig, "targets": [], "names": names,
+                   "target_sums": np.zeros((0, len(names)), dtype=np.int64),
+                   "target_covered": np.zeros((0, len(names)), dtype=np.int64),
+                   "mapq": {name: np.zeros(MAPQ_BINS, dtype=np.int64) for name in names},
+                   "regions": [], "sites": [(site, None) for site in entries]}
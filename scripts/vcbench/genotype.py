@@ -0,0 +1,116 @@
+"""Genotype-aware concordance for germline call sets
+
+``bcftools isec -c both`` and the report's variant sets compare sites only,
+so a 0/1 call at a 1/1 truth site counts as a TP. Here each VCF is parsed
+once into CHROM:POS:REF:ALT keys plus an int8 genotype code per record,
+all call sets are aligned to one union of sites, and the hom-ref/het/
+hom-alt/het-alt confusion matrices of every pipeline are built with one
+bincount.
+"""
+
+import numpy as np
+
+from .metrics import open_vcf, summarize, variant_key
+
+# Genotype codes; ABSENT also covers records without a fully called GT
+# (./., ./1, sites-only records, FORMAT without GT).
+# HET_ALT is a call with two different ALT alleles (1/2), kept apart from
+# HOM_ALT so that a 1/1 call at a 1/2 truth site is a genotype error.
+ABSENT, HOM_REF, HET, HOM_ALT, HET_ALT = 0, 1, 2, 3, 4
+GENOTYPE_LABELS = ["absent", "hom-ref", "het", "hom-alt", "het-alt"]
+VARIANT_CODES = [HET, HOM_ALT, HET_ALT]
+N_CODES = len(GENOTYPE_LABELS)
+
+
+def _genotype(gt, alt_alleles):
+    """Return (code, keyed ALT allele or None) for a GT string.
+
+    The key uses the ALT allele the GT actually calls, so a 0/2 call on an
+    ``ALT=C,G`` record is a G call. Het-alt calls are keyed by their
+    smallest called allele, preferring real alleles over the ``*``
+    spanning-deletion allele.
+    """
+    alleles = gt.replace("|", "/").split("/")
+    if "." in alleles or not all(allele.isdigit() for allele in alleles):
+        return ABSENT, None
+    indices = [int(allele) for allele in alleles]
+    if any(index > len(alt_alleles) for index in indices):
+        return ABSENT, None
+    called = sorted({alt_alleles[index - 1] for index in indices if index > 0},
+                    key=lambda allele: (allele == "*", allele))
+    if not called:
+        return HOM_REF, None
+    if 0 in indices:
+        return HET, called[0]
+    # Haploid calls (e.g. chrX/chrY after +fixploidy) count as hom-alt.
+    return (HOM_ALT if len(called) == 1 else HET_ALT), called[0]
+
+
+def read_genotypes(vcf_path, sample_index=0):
+    """Parse a VCF once into variant keys and an int8 array of genotype codes.
+
+    Keys come from ``variant_key()`` with the called ALT allele (the first
+    ALT for hom-ref or uncalled records). If a key repeats, the last record
+    wins.
+    """
+    codes = {}
+    with open_vcf(vcf_path) as handle:
+        for line in handle:
+            if line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            code, alt = ABSENT, None
+            if len(fields) > 9 + sample_index:
+                format_keys = fields[8].split(":")
+                values = fields[9 + sample_index].split(":")
+                if "GT" in format_keys and format_keys.index("GT") < len(values):
+                    code, alt = _genotype(values[format_keys.index("GT")], fields[4].split(","))
+            codes[variant_key(fields, alt)] = code
+    return list(codes), np.fromiter(codes.values(), dtype=np.int8, count=len(codes))
+
+
+def align_genotypes(truth, call_sets):
+    """Place the truth and every call set on one union of sites.
+
+    ``truth`` and each value of ``call_sets`` are (keys, codes) pairs.
+    Returns an int8 matrix of shape (1 + len(call_sets), n_sites); row 0 is
+    the truth, missing sites are ABSENT.
+    """
+    index = {}
+    for keys, _ in [truth, *call_sets.values()]:
+        for key in keys:
+            index.setdefault(key, len(index))
+
+    matrix = np.full((1 + len(call_sets), len(index)), ABSENT, dtype=np.int8)
+    for row, (keys, codes) in enumerate([truth, *call_sets.values()]):
+        positions = np.fromiter((index[key] for key in keys), dtype=np.int64, count=len(keys))
+        matrix[row, positions] = codes
+    return matrix
+
+
+def confusion_matrices(matrix):
+    """Return (n_pipelines, N_CODES, N_CODES) counts of truth code (rows) vs call code (columns)."""
+    truth, calls = matrix[0].astype(np.int64), matrix[1:].astype(np.int64)
+    n_pipelines = calls.shape[0]
+    cells = truth[None, :] * N_CODES + calls + (np.arange(n_pipelines) * N_CODES * N_CODES)[:, None]
+    counts = np.bincount(cells.ravel(), minlength=n_pipelines * N_CODES * N_CODES)
+    return counts.reshape(n_pipelines, N_CODES, N_CODES)
+
+
+def genotype_metrics(confusion):
+    """Genotype-level TP/FP/FN from one confusion matrix.
+
+    A TP needs the called genotype to match a het/hom-alt/het-alt truth
+    genotype; a variant call with the wrong genotype is both an FP and an FN.
+    """
+    variant = VARIANT_CODES
+    tp = int(sum(confusion[code, code] for code in variant))
+    called = int(confusion[:, variant].sum())
+    expected = int(confusion[variant, :].sum())
+    site_tp = int(confusion[np.ix_(variant, variant)].sum())
+    metrics = summarize(tp=tp, fp=called - tp, fn=expected - tp)
+    metrics["Site_TP"] = site_tp
+    metrics["GT_Concordance"] = tp / site_tp if site_tp > 0 else 0.0
+    return metrics
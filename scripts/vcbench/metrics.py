@@ -0,0 +1,24 @@
+"""VCF variant keys and TP/FP/FN summary metrics"""
+
+import gzip
+
+ISEC_FILES = {"FP": "0000.vcf", "FN": "0001.vcf", "TP": "0002.vcf"}
+
+
+def open_vcf(vcf_path):
+    vcf_path = str(vcf_path)
+    if vcf_path.endswith(".gz"):
+        return gzip.open(vcf_path, "rt")
+    return open(vcf_path)
+
+
+def variant_key(fields, alt=None):
+    """Return the CHROM:POS:REF:ALT key of a split VCF data line (``alt`` defaults to the first ALT allele)."""
+    return f"{fields[0]}:{fields[1]}:{fields[3]}:{alt or fields[4].split(',')[0]}"
+
+
+def summarize(tp, fp, fn):
+    precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+    recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if (2 * tp + fp + fn) > 0 else 0.0
+    return {"TP": tp, "FP": fp, "FN": fn, "Precision": precision, "Recall": recall, "F1": f1}
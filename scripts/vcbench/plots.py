@@ -0,0 +1,171 @@
+"""Report figures for the phase benchmarks
+
+Importing this module loads matplotlib and seaborn, so it is only imported
+inside the ``render`` worker processes.
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from .registry import CALLERS, WORKFLOWS
+from .report import FIGURE_FILES
+
+sns.set_style("whitegrid")
+plt.rcParams.update({
+    'font.family': 'sans-serif',
+    'font.size': 10,
+    'axes.titlesize': 14,
+    'axes.labelsize': 12,
+    'axes.titleweight': 'bold',
+    'axes.labelweight': 'bold',
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'savefig.bbox': 'tight'
+})
+
+PIPELINE_COLORS = {
+    "P1": "#6BAED6", "P2": "#FD8D3C", "P3": "#78C679", "P4": "#9E9AC8",
+    "P5": "#969696", "P6": "#FFC000", "P7": "#08519C", "P8": "#54278F"
+}
+
+FILTERING_STEPS = ["Raw VCF\n(After Calling)", "After Ploidy\nFix", "After Exome\nFilter", "After HC\nFilter", "Final PASS\nFilter"]
+
+# Variant counts recorded at each filtering step of the command scripts.
+FILTERING_COUNTS = {
+    "phase1": {
+        "P1": [32850, 32850, 1586, 1586, 1433],
+        "P2": [32961, 32961, 1644, 1644, 1477],
+        "P3": [31819, 31819, 1586, 1586, 1433],
+        "P4": [32963, 32963, 1644, 1644, 1477]
+    },
+    "phase2": {
+        "P1": [34914, 34914, 25016, 25016, 12020],
+        "P2": [218356, 218356, 155541, 155541, 23368],
+        "P3": [32193, 32193, 23368, 23368, 20466],
+        "P4": [216856, 217745, 155817, 155817, 23389],
+        "P5": [31261, 31261, 23048, 23048, 11580],
+        "P6": [177274, 177274, 129305, 129305, 4867],
+        "P7": [29598, 29598, 21914, 21914, 19707],
+        "P8": [176918, 177769, 129597, 129597, 4884]
+    },
+}
+
+FIGURE_STYLES = {
+    "phase1": {
+        "filtering": {"figsize": (14, 7), "width": 0.18, "label_offset": 200, "label_fontsize": 7,
+                      "legend_ncol": 1, "ylim": 38000},
+        "metrics": {"figsize": (10, 4), "fontsize": 11, "row_scale": 2.5},
+        "similarity": {"figsize": (10, 7), "label": "name"},
+    },
+    "phase2": {
+        "filtering": {"figsize": (16, 8), "width": 0.1, "label_offset": 1500, "label_fontsize": 6,
+                      "legend_ncol": 2, "ylim": 250000},
+        "metrics": {"figsize": (12, 5), "fontsize": 10, "row_scale": 2},
+        "similarity": {"figsize": (12, 10), "label": "workflow_caller"},
+    },
+}
+
+
+def visualization_1_filtering_counts(phase, pipelines, output_dir):
+    style = FIGURE_STYLES[phase]["filtering"]
+    pipeline_ids = [pipeline["id"] for pipeline in pipelines]
+    counts_by_pipeline = FILTERING_COUNTS[phase]
+
+    fig, ax = plt.subplots(figsize=style["figsize"])
+    x = np.arange(len(FILTERING_STEPS))
+    width = style["width"]
+
+    for i, pid in enumerate(pipeline_ids):
+        counts = counts_by_pipeline[pid]
+        positions = x + i*width
+        bars = ax.bar(positions, counts, width, label=pid, color=PIPELINE_COLORS[pid])
+        for bar, count in zip(bars, counts):
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + style["label_offset"],
+                   f'{count:,}', ha='center', va='bottom', fontsize=style["label_fontsize"], rotation=90)
+
+    ax.set_xlabel('Filtering Step', fontweight='bold')
+    ax.set_ylabel('Variant Count', fontweight='bold')
+    ax.set_title('Variant Counts After Each Filtering Step', fontweight='bold')
+    ax.set_xticks(x + width * (len(pipeline_ids) - 1) / 2)
+    ax.set_xticklabels(FILTERING_STEPS)
+    ax.legend(title='Pipeline', ncol=style["legend_ncol"], loc='upper right')
+    ax.set_ylim(0, style["ylim"])
+
+    plt.tight_layout()
+    path = output_dir / FIGURE_FILES["filtering"]
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def visualization_2_metrics(phase, pipelines, output_dir, metrics):
+    style = FIGURE_STYLES[phase]["metrics"]
+    pipeline_ids = [pipeline["id"] for pipeline in pipelines]
+
+    fig, ax = plt.subplots(figsize=style["figsize"])
+    ax.axis('tight')
+    ax.axis('off')
+
+    table_data = []
+    for pid in pipeline_ids:
+        m = metrics[pid]
+        table_data.append([
+            pid, f"{m['TP']}", f"{m['FP']}", f"{m['FN']}",
+            f"{m['Precision']:.2f}", f"{m['Recall']:.2f}", f"{m['F1']:.2f}"
+        ])
+
+    table = ax.table(cellText=table_data,
+                     colLabels=['Pipeline', 'TP', 'FP', 'FN', 'Precision', 'Recall', 'F1'],
+                     cellLoc='center', loc='center', bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    table.set_fontsize(style["fontsize"])
+    table.scale(1, style["row_scale"])
+
+    for i, pid in enumerate(pipeline_ids):
+        table[(i+1, 0)].set_facecolor(PIPELINE_COLORS[pid])
+        table[(i+1, 0)].set_text_props(weight='bold', color='white')
+        for j in range(1, 7):
+            table[(i+1, j)].set_facecolor('#f0f0f0')
+
+    ax.set_title('Performance Metrics Summary Table', fontweight='bold', pad=20)
+    plt.tight_layout()
+    path = output_dir / FIGURE_FILES["metrics"]
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def visualization_3_similarity_matrix(phase, pipelines, output_dir, similarity):
+    style = FIGURE_STYLES[phase]["similarity"]
+    by_id = {pipeline["id"]: pipeline for pipeline in pipelines}
+    pipeline_order = similarity["order"]
+    similarity_matrix = np.array(similarity["values"])
+    n = len(pipeline_order)
+
+    fig, ax = plt.subplots(figsize=style["figsize"])
+
+    annot = [[f'{similarity_matrix[i, j]:.2f}' for j in range(n)] for i in range(n)]
+    if style["label"] == "name":
+        labels = [f"{pid}\n{by_id[pid]['name']}" for pid in pipeline_order]
+    else:
+        labels = [f"{pid}\n{WORKFLOWS[by_id[pid]['workflow']]} + {CALLERS[by_id[pid]['caller']]['label']}"
+                  for pid in pipeline_order]
+    sns.heatmap(similarity_matrix, annot=annot, fmt='', cmap='YlOrRd',
+               vmin=0, vmax=1, xticklabels=labels, yticklabels=labels,
+               cbar_kws={'label': 'Jaccard Similarity'}, ax=ax, square=True,
+               linewidths=0.5, linecolor='white')
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+
+    ax.set_xlabel('Pipeline', fontweight='bold')
+    ax.set_ylabel('Pipeline', fontweight='bold')
+    ax.set_title('Pipeline Similarity Matrix (Jaccard Index)', fontweight='bold')
+
+    plt.tight_layout()
+    path = output_dir / FIGURE_FILES["similarity"]
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return path
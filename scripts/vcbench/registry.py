@@ -0,0 +1,130 @@
+"""Pipeline matrix and per-phase inputs shared by the cohort tooling
+
+The (mapper x workflow x caller) matrix is enumerated in the same order as
+the ``PIPELINES`` dicts of the visualization scripts, so pipeline ids (P1,
+P2, ...) mean the same thing everywhere.
+"""
+
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+REFERENCE_FASTA = PROJECT_ROOT / "data" / "reference" / "Homo_sapiens_assembly38.fasta"
+
+MAPPERS = {"bwa": "BWA", "bowtie": "Bowtie"}
+WORKFLOWS = {"cosap": "COSAP", "sarek": "Sarek"}
+
+CALLERS = {
+    "haplotype_caller": {
+        "label": "HaplotypeCaller",
+        "cosap_library": "HaplotypeCaller", "cosap_name": "caller",
+        "cosap_vcfs": ["VCF/haplotypecaller/caller.g.vcf", "VCF/haplotypecaller/caller.vcf"],
+        "sarek_tool": "haplotypecaller", "sarek_vcfs": ["*.haplotypecaller.vcf.gz"],
+        "pass_filter": ["-e", 'FILTER="LowQual"'],
+    },
+    "deep_variant": {
+        "label": "DeepVariant",
+        "cosap_library": "DeepVariant", "cosap_name": "caller",
+        "cosap_vcfs": ["VCF/deepvariant/caller.g.vcf", "VCF/deepvariant/caller.vcf"],
+        "sarek_tool": "deepvariant", "sarek_vcfs": ["*.deepvariant.vcf.gz"],
+        "sarek_args": ["--deepvariant_num_shards", "1", "--max_memory", "14.GB", "--max_cpus", "2"],
+        "pass_filter": ["-f", "PASS,.", "-e", 'ALT="<*>"'],
+    },
+    "mutect2": {
+        "label": "MuTect2",
+        "cosap_library": "MuTect2", "cosap_name": "mutect2",
+        "cosap_vcfs": ["VCF/mutect2/all_mutect2.vcf"],
+        "sarek_tool": "mutect2", "sarek_vcfs": ["*.mutect2.vcf.gz"],
+        "pass_filter": ["-f", "PASS,."],
+    },
+    "strelka2": {
+        "label": "Strelka2",
+        "cosap_library": "Strelka", "cosap_name": "strelka",
+        "cosap_vcfs": ["VCF/strelka/all_strelka.vcf"],
+        "sarek_tool": "strelka", "sarek_vcfs": ["*somatic_snvs.vcf.gz", "*somatic_indels.vcf.gz"],
+        "pass_filter": ["-f", "PASS,."],
+    },
+}
+
+PHASES = {
+    "phase1": {
+        "title": "Phase 1",
+        "somatic": False,
+        "mappers": ["bwa"],
+        "workflows": ["cosap", "sarek"],
+        "callers": ["haplotype_caller", "deep_variant"],
+        "exome_bed": PROJECT_ROOT / "bed_files" / "phase1" / "nexterarapidcapture_expandedexome_targetedregions.bed.gz",
+        "hc_bed": PROJECT_ROOT / "bed_files" / "phase1" / "HG001_GRCh38_1_22_v4.2.1_benchmark.bed",
+        "truth_vcf": PROJECT_ROOT / "data" / "phase1" / "truth_vcf" / "NA12878_exome_hc_filtered.vcf.gz",
+        "results_dir": PROJECT_ROOT / "results" / "phase1",
+        "similarity_order": ["P1", "P3", "P2", "P4"],
+        "sarek_args": [],
+    },
+    "phase2": {
+        "title": "Phase 2",
+        "somatic": True,
+        "mappers": ["bwa", "bowtie"],
+        "workflows": ["cosap", "sarek"],
+        "callers": ["mutect2", "strelka2"],
+        "exome_bed": PROJECT_ROOT / "bed_files" / "phase2" / "S07604624_Covered_human_all_v6_plus_UTR.liftover.to.hg38.bed6.gz",
+        "hc_bed": PROJECT_ROOT / "bed_files" / "phase2" / "High-Confidence_Regions_v1.2.bed",
+        "truth_vcf": PROJECT_ROOT / "data" / "phase2" / "truth_vcf" / "high-confidence_sSNV_exome_filtered.vcf.gz",
+        "results_dir": PROJECT_ROOT / "results" / "phase2",
+        "similarity_order": ["P6", "P8", "P2", "P4", "P1", "P5", "P3", "P7"],
+        "sarek_args": ["--nucleotides_per_second", "500"],
+        "bams": {
+            mapper: {role: PROJECT_ROOT / "data" / "phase2" / "bam" / mapper / f"unprocessed_{role}_{mapper}.sorted.bam"
+                     for role in ("tumor", "normal")}
+            for mapper in ("bwa", "bowtie")
+        },
+    },
+}
+
+
+def pipeline_matrix(phase):
+    """Return the phase's pipelines as dicts, numbered P1..Pn in mapper/workflow/caller order."""
+    config = PHASES[phase]
+    pipelines = []
+    for mapper in config["mappers"]:
+        for workflow in config["workflows"]:
+            for caller in config["callers"]:
+                parts = [WORKFLOWS[workflow], CALLERS[caller]["label"]]
+                if len(config["mappers"]) > 1:
+                    parts.insert(0, MAPPERS[mapper])
+                pipelines.append({"id": f"P{len(pipelines) + 1}", "name": " + ".join(parts),
+                                  "mapper": mapper, "workflow": workflow, "caller": caller})
+    return pipelines
+
+
+def sarek_config(phase, mapper, caller):
+    if phase == "phase1":
+        return PROJECT_ROOT / "scripts" / "phase1" / "sarek" / "nextflow.config"
+    name = "nextflow.config.strelka2" if caller == "strelka2" else "nextflow.config"
+    return PROJECT_ROOT / "scripts" / phase / mapper / "sarek" / name
+
+
+def metrics_dir(phase, pipeline, results_dir=None):
+    """Return the ``bcftools isec`` output directory of a pipeline from ``pipeline_matrix``."""
+    metrics_root = Path(results_dir or PHASES[phase]["results_dir"]) / "metrics"
+    if phase == "phase1":
+        if pipeline["workflow"] == "sarek":
+            return metrics_root / "sarek" / pipeline["caller"]
+        return metrics_root / pipeline["caller"]
+    return metrics_root / pipeline["mapper"] / pipeline["workflow"] / pipeline["caller"]
+
+
+PHASE1_FINAL_VCFS = {
+    ("cosap", "haplotype_caller"): Path("haplotype_caller") / "caller_final_filtered.vcf.gz",
+    ("cosap", "deep_variant"): Path("deep_variant") / "deepvariant_final_filtered.vcf.gz",
+    ("sarek", "haplotype_caller"): Path("sarek") / "haplotype_caller" / "sarek_final_filtered.vcf.gz",
+    ("sarek", "deep_variant"): Path("sarek") / "deep_variant" / "sarek_deepvariant_final_filtered.vcf.gz",
+}
+
+
+def final_vcf(phase, pipeline, results_dir=None):
+    """Return the filtered VCF written by a pipeline's command script."""
+    filtered_root = Path(results_dir or PHASES[phase]["results_dir"]) / "filtered"
+    if phase == "phase1":
+        return filtered_root / PHASE1_FINAL_VCFS[(pipeline["workflow"], pipeline["caller"])]
+    prefix = "sarek" if pipeline["workflow"] == "sarek" else pipeline["caller"]
+    return (filtered_root / pipeline["mapper"] / pipeline["workflow"] / pipeline["caller"]
+            / f"{prefix}_final_filtered.vcf.gz")
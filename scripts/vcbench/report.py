@@ -0,0 +1,93 @@
+"""Metrics table and similarity data for the phase reports
+
+Only standard-library code lives here so that ``benchmark_report.py
+metrics`` never pays for importing the plotting stack. VCFs are read with
+``bcftools view -H`` through the tool runner, all files of a report at
+once; a missing file counts as empty, a failing bcftools call is an error.
+"""
+
+from .metrics import ISEC_FILES, summarize
+from .registry import PHASES, final_vcf, metrics_dir, pipeline_matrix
+from .report_cache import update_similarity
+from .tools import CountRecords, VariantKeys, read_vcfs
+
+METRIC_COLUMNS = ["TP", "FP", "FN", "Precision", "Recall", "F1"]
+FIGURE_FILES = {
+    "filtering": "1_filtering_counts.png",
+    "metrics": "2_summary_table.png",
+    "similarity": "3_similarity_matrix.png",
+}
+
+
+def select_pipelines(phase, pipeline_ids=None):
+    """Return the phase's pipelines, optionally restricted to ``pipeline_ids``."""
+    pipelines = pipeline_matrix(phase)
+    if not pipeline_ids:
+        return pipelines
+    known = {pipeline["id"] for pipeline in pipelines}
+    unknown = [pid for pid in pipeline_ids if pid not in known]
+    if unknown:
+        raise ValueError(f"unknown {phase} pipeline(s): {', '.join(unknown)}")
+    return [pipeline for pipeline in pipelines if pipeline["id"] in pipeline_ids]
+
+
+def similarity_order(phase, pipelines):
+    selected = {pipeline["id"] for pipeline in pipelines}
+    return [pid for pid in PHASES[phase]["similarity_order"] if pid in selected]
+
+
+def _metric_requests(phase, pipelines, results_dir):
+    return [(metrics_dir(phase, pipeline, results_dir) / name, CountRecords, 0)
+            for pipeline in pipelines for name in ISEC_FILES.values()]
+
+
+def _metric_rows(pipelines, counts):
+    counts = iter(counts)
+    return {pipeline["id"]: summarize(**{label.lower(): next(counts) for label in ISEC_FILES})
+            for pipeline in pipelines}
+
+
+def _variant_requests(phase, pipelines, results_dir):
+    return [(final_vcf(phase, pipeline, results_dir), VariantKeys, set()) for pipeline in pipelines]
+
+
+def _variant_sets(pipelines, results):
+    variants = dict(zip((pipeline["id"] for pipeline in pipelines), results))
+    for pid, keys in variants.items():
+        print(f"  {pid}: {len(keys)} variants")
+    return variants
+
+
+def compute_all_metrics(phase, pipelines, results_dir=None, max_concurrency=None):
+    return _metric_rows(pipelines, read_vcfs(_metric_requests(phase, pipelines, results_dir), max_concurrency))
+
+
+def read_all_variants(phase, pipelines, results_dir=None, max_concurrency=None):
+    return _variant_sets(pipelines, read_vcfs(_variant_requests(phase, pipelines, results_dir), max_concurrency))
+
+
+def compute_report_data(phase, pipelines, datasets, results_dir=None, max_concurrency=None):
+    """Compute the "metrics" and/or "similarity" datasets with a single bcftools fan-out."""
+    metric_pipelines = pipelines if "metrics" in datasets else []
+    by_id = {pipeline["id"]: pipeline for pipeline in pipelines}
+    order = similarity_order(phase, pipelines) if "similarity" in datasets else []
+    variant_pipelines = [by_id[pid] for pid in order]
+
+    metric_requests = _metric_requests(phase, metric_pipelines, results_dir)
+    results = read_vcfs(metric_requests + _variant_requests(phase, variant_pipelines, results_dir), max_concurrency)
+    data = {}
+    if "metrics" in datasets:
+        data["metrics"] = _metric_rows(metric_pipelines, results[:len(metric_requests)])
+    if "similarity" in datasets:
+        variants = _variant_sets(variant_pipelines, results[len(metric_requests):])
+        data["similarity"] = update_similarity(None, order, variants, order)
+    return data
+
+
+def cache_inputs(phase, pipelines, results_dir=None):
+    """Return the (vcf_inputs, metric_inputs) path lists used by the incremental report cache."""
+    vcf_inputs = {pipeline["id"]: [final_vcf(phase, pipeline, results_dir)] for pipeline in pipelines}
+    metric_inputs = {pipeline["id"]: [metrics_dir(phase, pipeline, results_dir) / name
+                                      for name in sorted(ISEC_FILES.values())]
+                     for pipeline in pipelines}
+    return vcf_inputs, metric_inputs
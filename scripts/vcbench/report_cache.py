@@ -0,0 +1,131 @@
+"""Incremental report cache for the visualization scripts
+
+Keeps per-pipeline variant sets, metric rows and the Jaccard similarity
+matrix from the previous run, keyed by the size and mtime of each
+pipeline's inputs, so that re-running one pipeline only recomputes its
+own metric row and its row/column of the matrix. A dataset is reported as
+changed only when a recomputed value differs from the cached one.
+"""
+
+import json
+import os
+from pathlib import Path
+
+CACHE_VERSION = 1
+CACHE_FILENAME = ".report_cache.json"
+
+
+def empty_cache():
+    # "dirty" lists figures whose data changed but which have not been redrawn yet.
+    return {"version": CACHE_VERSION, "selection": None, "dirty": [], "inputs": {"variants": {}, "metrics": {}},
+            "variants": {}, "metrics": {}, "similarity": None}
+
+
+def load_cache(cache_path):
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        return empty_cache()
+    try:
+        with open(cache_path) as handle:
+            cache = json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"  Ignoring unreadable report cache {cache_path}: {e}")
+        return empty_cache()
+    if cache.get("version") != CACHE_VERSION:
+        return empty_cache()
+    return cache
+
+
+def save_cache(cache_path, cache):
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as handle:
+        json.dump(cache, handle)
+    os.replace(tmp_path, cache_path)
+
+
+def fingerprint(paths):
+    """Return [path, size, mtime_ns] for each input; missing files get None."""
+    entries = []
+    for path in paths:
+        path = Path(path)
+        if path.exists():
+            stat = path.stat()
+            entries.append([str(path), stat.st_size, stat.st_mtime_ns])
+        else:
+            entries.append([str(path), None, None])
+    return entries
+
+
+def stale_pipelines(cached_inputs, current_inputs):
+    return [pid for pid, entries in current_inputs.items() if cached_inputs.get(pid) != entries]
+
+
+def jaccard(set1, set2):
+    union = len(set1 | set2)
+    return len(set1 & set2) / union if union > 0 else 1.0
+
+
+def update_similarity(previous, pipeline_order, pipeline_variants, changed):
+    """Recompute the rows and columns of ``changed`` pipelines in a cached matrix.
+
+    ``previous`` is a {"order": [...], "values": [[...]]} dict from an earlier
+    run (or None); if its pipeline order differs every cell is recomputed.
+    """
+    n = len(pipeline_order)
+    if previous is None or previous.get("order") != list(pipeline_order):
+        changed = set(pipeline_order)
+        values = [[0.0] * n for _ in range(n)]
+    else:
+        changed = set(changed)
+        values = [list(row) for row in previous["values"]]
+
+    for i, pid1 in enumerate(pipeline_order):
+        for j in range(i, n):
+            pid2 = pipeline_order[j]
+            if pid1 in changed or pid2 in changed:
+                values[i][j] = values[j][i] = jaccard(pipeline_variants[pid1], pipeline_variants[pid2])
+    return {"order": list(pipeline_order), "values": values}
+
+
+def refresh_cache(cache, pipeline_order, vcf_inputs, metric_inputs, read_variants, compute_metrics):
+    """Bring the cached variants, metric rows and similarity matrix up to date.
+
+    ``vcf_inputs`` / ``metric_inputs`` map pipeline id to a list of input
+    paths. ``read_variants(pids)`` and ``compute_metrics(pids)`` are called
+    once with all stale pipelines, so the caller can read them in one batch,
+    and return {pid: variant set} and {pid: metric row}. Returns the names
+    of the cached datasets ("metrics", "similarity") whose values changed;
+    inputs that were touched or regenerated with identical content do not
+    count.
+    """
+    vcf_prints = {pid: fingerprint(paths) for pid, paths in vcf_inputs.items()}
+    metric_prints = {pid: fingerprint(paths) for pid, paths in metric_inputs.items()}
+    stale_vcfs = stale_pipelines(cache["inputs"]["variants"], vcf_prints)
+    stale_metrics = stale_pipelines(cache["inputs"]["metrics"], metric_prints)
+    changed = set()
+
+    if stale_metrics:
+        print(f"  Recomputing metrics: {', '.join(stale_metrics)}")
+    rows = compute_metrics(stale_metrics) if stale_metrics else {}
+    for pid, row in rows.items():
+        if cache["metrics"].get(pid) != row:
+            changed.add("metrics")
+        cache["metrics"][pid] = row
+        cache["inputs"]["metrics"][pid] = metric_prints[pid]
+
+    previous = cache["similarity"]
+    if stale_vcfs or previous is None or previous.get("order") != list(pipeline_order):
+        to_read = [pid for pid in pipeline_order if pid in stale_vcfs or pid not in cache["variants"]]
+        pipeline_variants = read_variants(to_read) if to_read else {}
+        for pid in pipeline_order:
+            if pid in pipeline_variants:
+                cache["variants"][pid] = sorted(pipeline_variants[pid])
+                cache["inputs"]["variants"][pid] = vcf_prints[pid]
+            else:
+                pipeline_variants[pid] = set(cache["variants"][pid])
+        cache["similarity"] = update_similarity(previous, pipeline_order, pipeline_variants, stale_vcfs)
+        if cache["similarity"] != previous:
+            changed.add("similarity")
+
+    return changed
@@ -0,0 +1,166 @@
+"""Shell-free asyncio runner for external tools (bcftools, tabix, bgzip, nextflow)
+
+Each invocation is an argv list executed with ``create_subprocess_exec``,
+never through a shell, so paths need no quoting. Independent invocations
+run concurrently under a semaphore; stdout is streamed line by line into
+a parser, and a non-zero exit raises ``ToolError`` instead of being read
+as empty output.
+"""
+
+import asyncio
+import os
+import signal
+import time
+
+from .metrics import variant_key
+
+DEFAULT_CONCURRENCY = min(8, os.cpu_count() or 1)
+STDERR_TAIL = 2000
+READ_CHUNK_SIZE = 1 << 16
+
+
+class ToolError(RuntimeError):
+    def __init__(self, argv, returncode, stderr, status=None):
+        self.argv = argv
+        self.returncode = returncode
+        self.stderr = stderr
+        detail = stderr.strip()[-STDERR_TAIL:]
+        if status is None:
+            status = "could not be started" if returncode is None else f"exited with status {returncode}"
+        # One-line form for tables; the message adds the command line and stderr tail.
+        self.summary = f"{argv[0]} {status}"
+        super().__init__(f"{self.summary}: {' '.join(argv)}" + (f"\n{detail}" if detail else ""))
+
+
+class CountRecords:
+    """Count VCF data lines (e.g. ``bcftools view -H`` output)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def feed(self, line):
+        if line.strip() and not line.startswith("#"):
+            self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class VariantKeys:
+    """Collect CHROM:POS:REF:ALT keys (first ALT allele) from VCF data lines."""
+
+    def __init__(self):
+        self.variants = set()
+
+    def feed(self, line):
+        if line.startswith("#"):
+            return
+        fields = line.rstrip("\n").split("\t", 5)
+        if len(fields) >= 5:
+            self.variants.add(variant_key(fields))
+
+    def result(self):
+        return self.variants
+
+
+async def _read_lines(stream):
+    """Yield decoded lines from ``stream`` without asyncio's 64 KiB line-length limit."""
+    pending = b""
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode(errors="replace") + "\n"
+    if pending:
+        yield pending.decode(errors="replace")
+
+
+async def run_tool(argv, parser=None, cwd=None, log=None, semaphore=None):
+    """Run one tool invocation and return a result dict.
+
+    Stdout lines go to ``parser.feed()`` (or to ``log`` when there is no
+    parser); stderr is captured and also copied to ``log``. The result holds
+    argv, returncode, elapsed seconds, stderr and ``parser.result()``.
+    """
+    argv = [str(arg) for arg in argv]
+    semaphore = semaphore or asyncio.Semaphore(1)
+    async with semaphore:
+        if log:
+            log.write(f"$ {' '.join(argv)}\n")
+            log.flush()
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                start_new_session=True)
+        except OSError as e:
+            raise ToolError(argv, None, str(e)) from e
+        stderr_task = asyncio.create_task(process.stderr.read())
+        try:
+            try:
+                async for line in _read_lines(process.stdout):
+                    if parser:
+                        parser.feed(line)
+                    elif log:
+                        log.write(line)
+            except Exception as e:
+                raise ToolError(argv, None, f"{type(e).__name__}: {e}", status="output could not be processed") from e
+            stderr = (await stderr_task).decode(errors="replace")
+            returncode = await process.wait()
+        finally:
+            # Only reached with a live process after an output error or a failed sibling invocation.
+            # Kill the whole process group: children that inherited stdout would keep wait() blocked.
+            if process.returncode is None:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                stderr_task.cancel()
+                await process.wait()
+        elapsed = time.perf_counter() - start
+
+    if log:
+        log.write(stderr)
+        log.write(f"# exit {returncode} after {elapsed:.1f}s\n")
+        log.flush()
+    if returncode != 0:
+        raise ToolError(argv, returncode, stderr)
+    return {"argv": argv, "returncode": returncode, "elapsed": elapsed, "stderr": stderr,
+            "output": parser.result() if parser else None}
+
+
+async def _run_tools(invocations, max_concurrency):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [asyncio.create_task(run_tool(semaphore=semaphore, **invocation)) for invocation in invocations]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_tools(invocations, max_concurrency=None):
+    """Run independent invocations (dicts of ``run_tool`` keyword arguments) concurrently.
+
+    Results come back in invocation order; the first failure raises ``ToolError``.
+    """
+    if not invocations:
+        return []
+    return asyncio.run(_run_tools(invocations, max_concurrency or DEFAULT_CONCURRENCY))
+
+
+def read_vcfs(requests, max_concurrency=None):
+    """Stream VCFs through ``bcftools view -H`` in one bounded fan-out.
+
+    ``requests`` is a list of (path, parser_class, empty) tuples. Returns one
+    result per request, in order; missing files give ``empty``.
+    """
+    present = [index for index, (path, _, _) in enumerate(requests) if path.exists()]
+    results = run_tools([{"argv": ["bcftools", "view", "-H", requests[index][0]], "parser": requests[index][1]()}
+                         for index in present], max_concurrency)
+    outputs = {index: result["output"] for index, result in zip(present, results)}
+    return [outputs.get(index, empty) for index, (_, _, empty) in enumerate(requests)]